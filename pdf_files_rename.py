@@ -6,118 +6,206 @@ CONFIGURATION:
   ROOT_DIR – Path to the target folder
   APPLY    – If False, only preview changes; if True, preview then confirm before renaming
 """
+import collections
+import functools
 import os
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # ─── CONFIGURATION ─────────────────────────────────────────────────────────────
 ROOT_DIR = Path("D:/03_checked")  # ← change this to your target folder
 APPLY    = True                    # ← set to True to enable renaming after preview
+RENAME_WORKERS = 8                 # ← parallel file renames per directory
+# Directories never descended into nor renamed (hidden '.*' dirs are always skipped)
+EXCLUDE_DIRS = {'__pycache__', 'node_modules', '.git', 'System Volume Information', '$RECYCLE.BIN'}
 # ───────────────────────────────────────────────────────────────────────────────
 
 # ─── Rule definitions ──────────────────────────────────────────────────────────
-def remove_substring(name: str, parent: str, substring='Documenti ') -> str:
-    return name.replace(substring, '') if substring in name else name
+# All rules are fused into a handful of precompiled passes so each name is walked
+# a constant number of times regardless of how many rules apply.
 
-def replace_substring(name: str, parent: str, substring=' - ') -> str:
-    return name.replace(substring, '_') if substring in name else name
+# File-only substitutions: drop 'Documenti ', turn ' - ' into '_'
+_SUB_RE   = re.compile(r'Documenti | - ')
+_SUB_REPL = {'Documenti ': '', ' - ': '_'}
 
-def strip_whitespace(name: str, parent: str) -> str:
-    return name.strip()
+# Spaces to underscores
+_SPACE_TBL = str.maketrans(' ', '_')
 
-def spaces_to_underscore(name: str, parent: str) -> str:
-    return name.replace(' ', '_')
+# Byte-level scrub table: ASCII alphanumerics map to themselves, every other byte
+# (including each byte of a multi-byte UTF-8 character) maps to '_'
+_SCRUB_TBL = bytes(c if chr(c).isascii() and chr(c).isalnum() else ord('_') for c in range(256))
 
-def to_lowercase(name: str, parent: str) -> str:
-    return name.lower()
-
-# Uncomment if you want parent prefixing for directories
+# Uncomment if you want parent prefixing for directories. clean_name no longer
+# receives the parent (its result is cached per name), so apply it in collect_and_rename
 # def prefix_parent_folder(name: str, parent: str) -> str:
 #     parent_name = Path(parent).name
 #     return f"{parent_name}_{name}" if parent_name else name
 
-def remove_non_alphanumeric(name: str, parent: str) -> str:
+def clean_name_fast(name_bytes: bytes) -> bytes:
+    """
+    Single-pass scrub of UTF-8 name bytes: every non-alphanumeric byte becomes '_'
+    and any run of '_' collapses to one. Leading/trailing '_' are kept; callers strip.
+    Both steps run in C (bytes.translate, split/join), no regex engine involved.
+    """
+    parts = name_bytes.translate(_SCRUB_TBL).split(b'_')
+    if len(parts) < 3:
+        return b'_'.join(parts)
+    # Empty inner parts come from runs; the outer parts keep a single edge '_'
+    return b'_'.join([parts[0], *filter(None, parts[1:-1]), parts[-1]])
+
+def _scrub_part(part: str) -> str:
+    return clean_name_fast(part.encode('utf-8', 'surrogatepass')).decode('ascii')
+
+def _scrub(name: str) -> str:
+    # Replace non-alphanumerics, keeping the last dot (extension separator)
     base, sep, ext = name.rpartition('.')
     if sep and ext:
-        cleaned_base = re.sub(r'[^A-Za-z0-9_]', '_', base)
-        cleaned_ext  = re.sub(r'[^A-Za-z0-9_]', '_', ext)
-        return f"{cleaned_base}.{cleaned_ext}"
-    return re.sub(r'[^A-Za-z0-9_]', '_', name)
-
-def remove_duplicate_underscores(name: str, parent: str) -> str:
-    return re.sub(r'_{2,}', '_', name)
-
-def strip_underscores(name: str, parent: str) -> str:
-    return name.strip('_')
-
-def remove_dots_from_dir(name: str, parent: str) -> str:
-    return name.replace('.', '_')
-
-# List of (function, apply_to) tuples: "both", "file", or "dir"
-rules = [
-    (remove_substring,       "file"),
-    (replace_substring,      "file"),
-    (strip_whitespace,       "both"),
-    (spaces_to_underscore,   "both"),
-    (to_lowercase,           "both"),
-    # (prefix_parent_folder,   "dir"),
-    (remove_non_alphanumeric,"both"),
-    (remove_duplicate_underscores, "both"),
-    (strip_underscores,      "both"),
-    (remove_dots_from_dir,   "dir"),  # <-- add this rule for directories only
-]
-
-def clean_name(name: str, parent: str, kind: str) -> str:
-    for func, apply_to in rules:
-        if apply_to == 'both' or apply_to == kind:
-            name = func(name, parent)
-    return name
+        return f"{_scrub_part(base)}.{_scrub_part(ext)}"
+    return _scrub_part(name)
+
+def _clean_file(name: str) -> str:
+    name = _SUB_RE.sub(lambda m: _SUB_REPL[m.group()], name)
+    return _scrub(name.strip().lower().translate(_SPACE_TBL)).strip('_')
+
+def _clean_dir(name: str) -> str:
+    return _scrub(name.strip().lower().translate(_SPACE_TBL)).strip('_').replace('.', '_')
+
+# Names that are already clean (the rules would return them unchanged):
+# lowercase alphanumerics and single inner underscores, plus one extension for files
+_CANONICAL_FILE_RE = re.compile(r'(?!_)(?!.*__)[a-z0-9_]+(?:\.[a-z0-9_]+)?(?<!_)')
+_CANONICAL_DIR_RE  = re.compile(r'(?!_)(?!.*__)[a-z0-9_]+(?<!_)')
+
+# The result depends only on (name, kind), and names like "index.pdf" repeat
+# across customer folders, so repeated names cost a dict lookup
+@functools.lru_cache(maxsize=100_000)
+def _clean_cached(name: str, kind: str) -> str:
+    return _clean_dir(name) if kind == 'dir' else _clean_file(name)
+
+def clean_name(name: str, kind: str) -> str:
+    # Fast path for already-cleaned trees: one C-level match, no rules, no cache entry
+    canonical = _CANONICAL_DIR_RE if kind == 'dir' else _CANONICAL_FILE_RE
+    if canonical.fullmatch(name):
+        return name
+    return _clean_cached(name, kind)
 
 # ─── Collision resolution ───────────────────────────────────────────────────────
-def resolve_collision(dest: Path) -> Path:
+def resolve_collision(parent: str, name: str, sibling_names: set = None) -> str:
     """
-    If `dest` already exists, append _1, _2, ... before the extension until unique.
+    If `name` is already taken in `parent`, append _1, _2, ... before the extension
+    until unique. Returns the full destination path.
+
+    `sibling_names` holds the lowercased names present in `parent`; the chosen name
+    is added to it. When omitted, the free case costs a single lexists() call and
+    only a collision pays for one directory listing, so K conflicting candidates
+    never mean K stat calls.
     """
-    if not dest.exists():
-        return dest
-    stem = dest.stem
-    suffix = dest.suffix
-    parent = dest.parent
+    if sibling_names is None:
+        if not os.path.lexists(parent + os.sep + name):
+            return parent + os.sep + name
+        sibling_names = {n.lower() for n in os.listdir(parent)}
+    stem, suffix = os.path.splitext(name)
+    candidate = name
     i = 1
-    while True:
-        new_name = f"{stem}_{i}{suffix}"
-        candidate = parent / new_name
-        if not candidate.exists():
-            return candidate
+    while candidate.lower() in sibling_names:
+        candidate = f"{stem}_{i}{suffix}"
         i += 1
+    sibling_names.add(candidate.lower())
+    return parent + os.sep + candidate
 
 # ─── Preview & Apply ───────────────────────────────────────────────────────────
+def _is_excluded(dname: str) -> bool:
+    return dname.startswith('.') or dname in EXCLUDE_DIRS
+
+def _walk_bottom_up(root: str):
+    """
+    Like os.walk(root, topdown=False), but yields (dirpath, dir_entries, file_entries)
+    with os.DirEntry objects so no extra stat calls or Path objects are needed.
+    Symlinked and excluded directories are listed but not descended into.
+    """
+    dir_entries, file_entries = [], []
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                (dir_entries if is_dir else file_entries).append(entry)
+    except OSError:
+        return
+    for entry in dir_entries:
+        if not entry.is_symlink() and not _is_excluded(entry.name):
+            yield from _walk_bottom_up(entry.path)
+    yield root, dir_entries, file_entries
+
 def collect_and_rename(root: Path, dry_run: bool = True):
     """
     Traverse bottom-up: rename files first, then directories.
     If `dry_run` is True, only print proposed changes.
+
+    File renames within a directory are issued in parallel on a thread pool
+    (the rename syscall releases the GIL); destinations are resolved serially
+    beforehand so no two renames can claim the same name. Directory renames
+    stay serial. Output is written once per directory rather than per entry.
     """
-    for dirpath, dirnames, filenames in os.walk(root, topdown=False):
-        base = Path(dirpath)
-        # Rename files
-        for fname in filenames:
-            src = base / fname
-            new_name = clean_name(fname, str(base), 'file')
-            if new_name != fname:
-                dest = resolve_collision(base / new_name)
-                if dry_run:
-                    print(f"[DRY RUN] File:\n{src}\n{dest}")
-                else:
-                    src.rename(dest)
-                    print(f"Renamed file:\n{src}\n{dest}")
-        # Rename directories
-        for dname in dirnames:
-            src = base / dname
-            new_name = clean_name(dname, str(base), 'dir')
-            if new_name != dname:
-                dest = resolve_collision(base / new_name)
+    with ThreadPoolExecutor(max_workers=RENAME_WORKERS) as executor:
+        for dirpath, dir_entries, file_entries in _walk_bottom_up(str(root)):
+            out = []
+            try:
+                # Lowercased so collisions are caught on case-insensitive filesystems too.
+                # Several entries can share a lowercased name (Report.pdf, REPORT.PDF), so
+                # occupants are counted per name and a name is only freed for reuse once
+                # its last occupant has been renamed away
+                occupants = collections.Counter(e.name.lower() for e in dir_entries)
+                occupants.update(e.name.lower() for e in file_entries)
+                sibling_names = set(occupants)
+
+                def claim(entry, new_name):
+                    key = entry.name.lower()
+                    occupants[key] -= 1
+                    if not occupants[key]:
+                        sibling_names.discard(key)
+                    dest = resolve_collision(dirpath, new_name, sibling_names)
+                    occupants[os.path.basename(dest).lower()] += 1
+                    return dest
+
+                # Rename files
+                renames = []
+                for entry in file_entries:
+                    new_name = clean_name(entry.name, 'file')
+                    if new_name != entry.name:
+                        renames.append((entry.path, claim(entry, new_name)))
                 if dry_run:
-                    print(f"[DRY RUN] Dir:\n{src}\n{dest}")
-                else:
-                    src.rename(dest)
-                    print(f"Renamed dir:\n{src}\n{dest}")
\ No newline at end of file
+                    out.extend(f"[DRY RUN] File:\n{src}\n{dest}\n" for src, dest in renames)
+                elif renames:
+                    futures = [executor.submit(os.rename, src, dest) for src, dest in renames]
+                    # Every rename that succeeded is reported, even if another one in
+                    # this directory failed; the first error is raised afterwards
+                    error = None
+                    for (src, dest), future in zip(renames, futures):
+                        try:
+                            future.result()
+                        except Exception as e:
+                            error = error or e
+                            continue
+                        out.append(f"Renamed file:\n{src}\n{dest}\n")
+                    if error is not None:
+                        raise error
+                # Rename directories (excluded ones still count as siblings above)
+                for entry in dir_entries:
+                    if _is_excluded(entry.name):
+                        continue
+                    new_name = clean_name(entry.name, 'dir')
+                    if new_name != entry.name:
+                        dest = claim(entry, new_name)
+                        if dry_run:
+                            out.append(f"[DRY RUN] Dir:\n{entry.path}\n{dest}\n")
+                        else:
+                            os.rename(entry.path, dest)
+                            out.append(f"Renamed dir:\n{entry.path}\n{dest}\n")
+            finally:
+                # One write (and one line-buffer flush) per directory
+                if out:
+                    sys.stdout.write(''.join(out))
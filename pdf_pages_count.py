@@ -1,13 +1,13 @@
-# Requires: pip install tabulate PyPDF2
+# Requires: pip install tabulate pikepdf
 import logging
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Union
-from PyPDF2 import PdfReader
-from PyPDF2.errors import PdfReadWarning
+from typing import Dict, Iterator, List, Union
+import pikepdf
 from tabulate import tabulate
-import warnings
-
-warnings.filterwarnings("ignore", category=PdfReadWarning)
 
 # --- Logging setup ---
 LOG_DIR = Path('logs')
@@ -17,37 +17,162 @@ LOG_FILE = LOG_DIR / 'check.txt'
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-# File handler
-fh = logging.FileHandler(LOG_FILE, mode='w', encoding='utf-8')
-fh.setLevel(logging.INFO)
-formatter = logging.Formatter('%(asctime)s | %(levelname)-7s | %(message)s')
-fh.setFormatter(formatter)
-logger.addHandler(fh)
-
-# Console handler
-ch = logging.StreamHandler()
-ch.setLevel(logging.INFO)
-ch.setFormatter(formatter)
-logger.addHandler(ch)
+def setup_logging(mode: str = 'w') -> None:
+    """
+    Attach the file and console handlers. Called by the main process with
+    mode='w' and by spawned pool workers with mode='a', so workers don't
+    truncate the log; forked workers inherit the handlers and skip this.
+    The log is truncated up front and then always opened for appending: every
+    process writes at the current end of file, so the main process cannot
+    overwrite lines written by the workers from its own stale file offset.
+    """
+    if logger.handlers:
+        return
+    formatter = logging.Formatter('%(asctime)s | %(levelname)-7s | %(message)s')
+
+    if mode == 'w':
+        open(LOG_FILE, 'w', encoding='utf-8').close()
+
+    # File handler
+    fh = logging.FileHandler(LOG_FILE, mode='a', encoding='utf-8')
+    fh.setLevel(logging.INFO)
+    fh.setFormatter(formatter)
+    logger.addHandler(fh)
+
+    # Console handler
+    ch = logging.StreamHandler()
+    ch.setLevel(logging.INFO)
+    ch.setFormatter(formatter)
+    logger.addHandler(ch)
 # ---------------------
 
+# --- Fast /Count extraction ---
+# Only one integer per file is needed, so instead of running a PDF parser we
+# memory-map the file and follow startxref -> trailer /Root -> /Pages -> /Count
+# with a few regex searches. Anything unusual (compressed object streams,
+# broken offsets, ...) raises and falls back to pikepdf.
+_STARTXREF_RE = re.compile(rb'startxref\s+(\d+)')
+_ROOT_RE      = re.compile(rb'/Root\s+(\d+)\s+(\d+)\s+R')
+_PAGES_RE     = re.compile(rb'/Pages\s+(\d+)\s+(\d+)\s+R')
+# An indirect '/Count 12 0 R' must not match: (?!\d) stops the digits from
+# backtracking to '1' so that the reference lookahead no longer applies
+_COUNT_RE     = re.compile(rb'/Count\s+(\d+)(?!\d)(?!\s+\d+\s+R\b)')
+
+def _object_body(mm: mmap.mmap, num: int, gen: int) -> bytes:
+    # The last definition wins: incremental updates append newer versions
+    match = None
+    for match in re.finditer(rb'(?<!\d)%d\s+%d\s+obj\b' % (num, gen), mm):
+        pass
+    if match is None:
+        raise ValueError(f"object {num} {gen} not found")
+    end = mm.find(b'endobj', match.end())
+    if end == -1:
+        raise ValueError(f"object {num} {gen} not terminated")
+    return mm[match.end():end]
+
+def _fast_count(f) -> int:
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        startxrefs = list(_STARTXREF_RE.finditer(mm, max(0, len(mm) - 1024)))
+        if not startxrefs:
+            raise ValueError("startxref not found")
+        root = _ROOT_RE.search(mm, int(startxrefs[-1].group(1)))
+        if root is None:
+            raise ValueError("/Root not found")
+        pages = _PAGES_RE.search(_object_body(mm, int(root.group(1)), int(root.group(2))))
+        if pages is None:
+            raise ValueError("/Pages not found")
+        count = _COUNT_RE.search(_object_body(mm, int(pages.group(1)), int(pages.group(2))))
+        if count is None:
+            raise ValueError("/Count not found")
+        return int(count.group(1))
+
+def _count_one(path_str: str) -> int:
+    """
+    Page count of a single PDF (0 if unreadable). Module-level so it can be
+    pickled into pool workers. The file is opened once and shared by the fast
+    path and the pikepdf fallback.
+    """
+    try:
+        with open(path_str, 'rb') as f:
+            try:
+                return _fast_count(f)
+            except Exception:
+                f.seek(0)
+            # qpdf (C++) opens lazily; read the /Count entry from the page tree root
+            # instead of walking the pages
+            with pikepdf.open(f, access_mode=pikepdf.AccessMode.mmap) as pdf:
+                return int(pdf.Root.Pages.Count)
+    except Exception as e:
+        logger.warning(f"⚠️ Skipping {path_str!r}: {e}")
+        return 0
+
+def _iter_pdfs(folder: Union[str, Path]) -> Iterator[str]:
+    """
+    Recursively yield the paths of PDFs under `folder` as strings. Uses
+    os.scandir so no per-entry Path objects (or extra stat calls) are created;
+    symlinked directories are not followed, as with Path.rglob.
+    """
+    stack = [os.fspath(folder)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.lower().endswith('.pdf') and entry.is_file():
+                            yield entry.path
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.warning(f"⚠️ Cannot list {e.filename!r}: {e}")
+
+def _file_key(path_str: str):
+    """
+    Identity of a file's content: (device, inode, mtime, size), so the same PDF
+    reached through symlinks/hardlinks or duplicate customer folders is parsed once.
+    Falls back to the path when the filesystem reports no inode.
+    """
+    try:
+        st = os.stat(path_str)
+    except OSError:
+        return path_str
+    if not st.st_ino:
+        return path_str, st.st_mtime_ns, st.st_size
+    return st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size
+
+def count_pages_by_folder(folders: List[Union[str, Path]]) -> Dict[Union[str, Path], int]:
+    """
+    Page totals for several folders in a single process-pool run, so all folders
+    are counted concurrently and each distinct file is parsed only once.
+    """
+    folder_paths = {folder: list(_iter_pdfs(folder)) for folder in folders}
+
+    path_keys = {}
+    unique = {}  # file key -> first path seen with that key
+    for paths in folder_paths.values():
+        for path_str in paths:
+            key = path_keys[path_str] = _file_key(path_str)
+            unique.setdefault(key, path_str)
+
+    counts = {}
+    if unique:
+        with ProcessPoolExecutor(initializer=setup_logging, initargs=('a',)) as ex:
+            counts = dict(zip(unique, ex.map(_count_one, unique.values(), chunksize=32)))
+
+    return {folder: sum(counts[path_keys[p]] for p in paths)
+            for folder, paths in folder_paths.items()}
+
 def count_pdf_pages(folder: Union[str, Path]) -> int:
     """
     Recursively count all pages in every PDF under `folder` using metadata only.
+    Files are counted in parallel on a process pool.
     """
-    total_pages = 0
-    folder = Path(folder)
-    for pdf_path in folder.rglob('*.pdf'):
-        try:
-            reader = PdfReader(str(pdf_path))
-            # Use the /Count entry from the page tree root instead of loading all pages
-            page_count = reader.trailer['/Root']['/Pages']['/Count']
-            total_pages += page_count
-        except Exception as e:
-            logger.warning(f"⚠️ Skipping {pdf_path!r}: {e}")
-    return total_pages
+    return count_pages_by_folder([folder])[folder]
 
 if __name__ == "__main__":
+    setup_logging()
+
     root1 = Path("D:/01_unzipped")
     root2 = Path("D:/02_processed")
 
@@ -69,14 +194,16 @@ if __name__ == "__main__":
     table = tabulate(rows, headers=[str(root1), "customer_folder", str(root2)], tablefmt="github")
     logger.info("Customer-folder presence:\n" + table)
 
-    # Compare page counts for common customers
+    # Compare page counts for common customers; both roots are counted in one pool run
     logger.info("Page counts for common customers:")
-    for customer in sorted(names1 & names2):
+    common = sorted(names1 & names2)
+    page_counts = count_pages_by_folder([root / c for c in common for root in (root1, root2)])
+    for customer in common:
         folder1 = root1 / customer
         folder2 = root2 / customer
 
-        pages1 = count_pdf_pages(folder1)
-        pages2 = count_pdf_pages(folder2)
+        pages1 = page_counts[folder1]
+        pages2 = page_counts[folder2]
 
         status = "✅" if pages1 == pages2 else "❌"
         logger.info(f"{status} {customer}")
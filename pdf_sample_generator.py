@@ -1,39 +1,39 @@
 import os
 import random
 import io
-from PyPDF2 import PdfReader, PdfWriter
+import pikepdf
 from pathlib import Path
 
 def get_all_pdf_paths(folder):
     return list(Path(folder).rglob("*.pdf"))
 
 def merge_and_rotate_pdfs(pdf_paths, rotate_probability=0.8, page_cap=None):
-    writer = PdfWriter()
-    all_pages = []
-
-    # Process each PDF and collect the pages
-    for pdf_path in pdf_paths:
-        reader = PdfReader(str(pdf_path))
-        for page in reader.pages:
+    # Source PDFs must stay open until the output is saved: pikepdf copies
+    # the appended pages' objects lazily
+    sources = [pikepdf.open(pdf_path) for pdf_path in pdf_paths]
+    try:
+        # Index every page as (pdf, page_idx) without touching any page yet
+        offsets = [(pdf, idx) for pdf in sources for idx in range(len(pdf.pages))]
+
+        # Pick the pages to keep in random order; sampling the whole list is a shuffle
+        k = min(page_cap, len(offsets)) if page_cap else len(offsets)
+        chosen = random.sample(offsets, k)
+
+        # Pages are copied by reference; rotation only sets /Rotate, content
+        # streams are never re-encoded
+        merged = pikepdf.new()
+        for pdf, idx in chosen:
+            merged.pages.append(pdf.pages[idx])
             if random.random() < rotate_probability:
                 angle = random.choice([90, 180, 270])
-                page.rotate(angle)
-            all_pages.append(page)
-
-    # Shuffle all pages
-    random.shuffle(all_pages)
-
-    # Cap the number of pages if necessary
-    if page_cap:
-        all_pages = all_pages[:page_cap]
-
-    # Add pages to the writer
-    for page in all_pages:
-        writer.add_page(page)
-
-    # Create an in-memory PDF output
-    output_pdf_io = io.BytesIO()
-    writer.write(output_pdf_io)
+                merged.pages[-1].rotate(angle, relative=True)
+
+        # Create an in-memory PDF output
+        output_pdf_io = io.BytesIO()
+        merged.save(output_pdf_io, linearize=False)
+    finally:
+        for pdf in sources:
+            pdf.close()
 
     # Return the in-memory PDF
     return output_pdf_io.getvalue()
@@ -1,17 +1,24 @@
 import os
+import sys
 from pathlib import Path
 import time
+import math
+import sqlite3
+import functools
+import itertools
 import logging
+import logging.handlers
+import multiprocessing
 import threading
 import queue
+import signal
 import traceback
+import tempfile
 from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
 from watchdog.events import FileSystemEventHandler
 import fitz  # PyMuPDF
-from pdf2image import convert_from_path
 import pytesseract
-from PIL import Image
-import io
 from concurrent.futures import ProcessPoolExecutor
 from dotenv import load_dotenv
 from pdf_files_rename import clean_name, resolve_collision
@@ -20,118 +27,419 @@ from pdf_files_rename import clean_name, resolve_collision
 load_dotenv(override=True)
 WATCH_FOLDER        = os.path.abspath(os.getenv('WATCH_FOLDER', './input'))
 OUTPUT_FOLDER       = os.path.abspath(os.getenv('OUTPUT_FOLDER', './output'))
-PROCESSED_FILE_PATH = os.path.abspath(os.getenv('PROCESSED_FILE_PATH', './processed_files.txt'))
+PROCESSED_DB_PATH   = os.path.abspath(os.getenv('PROCESSED_DB_PATH', './processed_files.db'))
 ERROR_LOG_PATH      = os.path.abspath(os.getenv('ERROR_LOG_PATH', './error_log.txt'))
 WARNINGS_LOG_PATH   = os.path.abspath(os.getenv('WARNINGS_LOG_PATH', './warnings_log.txt'))
 MAX_WORKERS         = int(os.getenv('MAX_WORKERS', '4'))
-RETRIES             = int(os.getenv('FILE_READY_RETRIES', '10'))
-RETRY_DELAY         = float(os.getenv('FILE_READY_DELAY', '1'))
-
-# Prepare output folder and logs
+# Replace a pool worker after this many pages (Python 3.11+, 0 = never) to bound
+# memory held by libtesseract/MuPDF in long-running workers. Off by default: on
+# CPython 3.11-3.13 the pool can stop spawning replacements for retired workers,
+# leaving the remaining pages queued forever
+MAX_TASKS_PER_CHILD = int(os.getenv('MAX_TASKS_PER_CHILD', '0'))
+RECYCLE_WORKERS     = MAX_TASKS_PER_CHILD > 0 and sys.version_info >= (3, 11)
+# A new file is ready once its size and mtime are unchanged between two samples,
+# taken 50 ms apart at first and backing off up to FILE_READY_POLL seconds
+FILE_READY_MIN_DELAY = 0.05
+FILE_READY_POLL     = float(os.getenv('FILE_READY_POLL', '0.2'))
+FILE_READY_TIMEOUT  = float(os.getenv('FILE_READY_TIMEOUT', '30'))
+# When the watch folder is polled (network shares), a file must also hold still
+# this many seconds: polling reports changes late and NFS/SMB attribute caching
+# can return the same size for a file that is still growing
+FILE_READY_POLLED_STABLE = float(os.getenv('FILE_READY_POLLED_STABLE', '10'))
+# Quiet time after the last watchdog event for a path before it is handled
+DEBOUNCE_DELAY      = float(os.getenv('DEBOUNCE_DELAY', '0.5'))
+# Watch by polling instead of native FS events: 'auto' polls only on network shares
+WATCH_POLLING       = os.getenv('WATCH_POLLING', 'auto').lower()
+WATCH_POLL_INTERVAL = int(os.getenv('WATCH_POLL_INTERVAL', '30'))
+# Re-render rotated image-only pages as images instead of setting the page
+# /Rotate entry; pages with a text layer are always rotated through /Rotate
+RASTER_ROTATION     = os.getenv('RASTER_ROTATION', 'false').lower() == 'true'
+# Split every PDF into single-page files; when false, each PDF is written back
+# as one multi-page file with its pages rotated
+SPLIT_PAGES         = os.getenv('SPLIT_PAGES', 'true').lower() == 'true'
+
+# Prepare output folder
 os.makedirs(OUTPUT_FOLDER, exist_ok=True)
-# Ensure warnings log exists
-open(WARNINGS_LOG_PATH, 'a').close()
-
-# Logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-# Handler for warnings
-warnings_handler = logging.FileHandler(WARNINGS_LOG_PATH)
-warnings_handler.setLevel(logging.WARNING)
-warnings_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-logging.getLogger().addHandler(warnings_handler)
-
-# Load processed-files set
-def load_processed_files():
-    if os.path.exists(PROCESSED_FILE_PATH):
-        with open(PROCESSED_FILE_PATH, 'r') as f:
-            return set(f.read().splitlines())
-    return set()
-
-processed_files = load_processed_files()
+
+# === Logging ===
+# Every process (main threads and pool workers) logs through a QueueHandler;
+# a single QueueListener in the main process owns the console and the log
+# files, so workers never write the files themselves. Records logged with
+# extra={'file': path} also go to the error log.
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+# Start method of the pool, and so of the queue shared with it. Always spawn:
+# forking a parent that already runs the listener, writer and watcher threads
+# is unsafe, recycling workers (max_tasks_per_child) requires it anyway, and
+# the heavy imports and OSD setup are paid once per worker by _init_worker
+mp_context = multiprocessing.get_context('spawn')
+log_queue = None
+log_listener = None
+
+def _install_queue_handler(q):
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(q)]
+    root.setLevel(logging.INFO)
+
+def setup_logging():
+    """Main process only: start the listener and route this process's logging to it."""
+    global log_queue, log_listener
+    # Ensure warnings log exists
+    open(WARNINGS_LOG_PATH, 'a').close()
+
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(LOG_FORMAT))
+    # Handler for warnings
+    warnings_handler = logging.FileHandler(WARNINGS_LOG_PATH, delay=True)
+    warnings_handler.setLevel(logging.WARNING)
+    warnings_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    # Handler for per-file errors
+    errors_handler = logging.FileHandler(ERROR_LOG_PATH, delay=True)
+    errors_handler.setLevel(logging.ERROR)
+    errors_handler.addFilter(lambda record: hasattr(record, 'file'))
+    errors_handler.setFormatter(logging.Formatter('%(asctime)s - %(file)s - %(message)s',
+                                                  datefmt='%Y-%m-%d %H:%M:%S'))
+
+    log_queue = mp_context.Queue()
+    log_listener = logging.handlers.QueueListener(log_queue, console, warnings_handler, errors_handler,
+                                                  respect_handler_level=True)
+    log_listener.start()
+    _install_queue_handler(log_queue)
+
+# Processed-files store: SQLite in WAL mode, one row per source PDF with the
+# mtime/size it had when processed, so an edited file is picked up again.
+# A single connection shared by all threads, serialized by processed_lock;
+# opened by start_processing().
+def open_processed_db():
+    db = sqlite3.connect(PROCESSED_DB_PATH, check_same_thread=False)
+    db.execute('PRAGMA journal_mode=WAL')
+    db.execute('PRAGMA synchronous=NORMAL')
+    db.execute('CREATE TABLE IF NOT EXISTS processed('
+               'path TEXT PRIMARY KEY, mtime REAL, size INTEGER)')
+    return db
+
+processed_db = None
 processed_lock = threading.Lock()
 
-def append_processed_file(path: str):
-    with open(PROCESSED_FILE_PATH, 'a') as f:
-        f.write(path + "\n")
+def file_signature(path: str):
+    st = os.stat(path)
+    return st.st_mtime, st.st_size
+
+def is_processed(path: str) -> bool:
+    try:
+        mtime, size = file_signature(path)
+    except OSError:
+        return False
     with processed_lock:
-        processed_files.add(path)
+        if processed_pending.get(path) == (mtime, size):
+            return True
+        row = processed_db.execute('SELECT 1 FROM processed WHERE path=? AND mtime=? AND size=?',
+                                   (path, mtime, size)).fetchone()
+    return row is not None
+
+# Rows are written by a single writer thread, batched into one transaction per
+# PROCESSED_BATCH rows or PROCESSED_FLUSH_INTERVAL seconds, whichever comes first
+PROCESSED_BATCH = 128
+PROCESSED_FLUSH_INTERVAL = 1.0
+processed_writes = queue.Queue()
+# Rows queued but not yet committed (path -> signature), so is_processed sees
+# them in the meantime; guarded by processed_lock
+processed_pending = {}
+
+def append_processed_file(path: str, signature):
+    with processed_lock:
+        processed_pending[path] = tuple(signature)
+    processed_writes.put((path, *signature))
+
+def processed_writer():
+    stop = False
+    while not stop:
+        batch = [processed_writes.get()]
+        deadline = time.monotonic() + PROCESSED_FLUSH_INTERVAL
+        while len(batch) < PROCESSED_BATCH and batch[-1] is not None:
+            try:
+                batch.append(processed_writes.get(timeout=max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                break
+        if batch[-1] is None:
+            stop = True
+            batch.pop()
+        if not batch:
+            continue
+        with processed_lock:
+            try:
+                with processed_db:
+                    processed_db.executemany('INSERT OR REPLACE INTO processed(path, mtime, size)'
+                                             ' VALUES (?, ?, ?)', batch)
+            except sqlite3.Error as e:
+                logging.error(f"Failed to record {len(batch)} processed file(s): {e}")
+            # Committed (or failed for good): drop unless re-queued with a newer signature
+            for path, *signature in batch:
+                if processed_pending.get(path) == tuple(signature):
+                    del processed_pending[path]
+
+def processed_count() -> int:
+    with processed_lock:
+        return processed_db.execute('SELECT COUNT(*) FROM processed').fetchone()[0]
 
-def log_error(path: str, msg: str):
-    ts = time.strftime('%Y-%m-%d %H:%M:%S')
-    with open(ERROR_LOG_PATH, 'a') as f:
-        f.write(f"{ts} - {path} - {msg}\n")
+def reset_processed():
+    with processed_lock, processed_db:
+        processed_db.execute('DELETE FROM processed')
 
-def wait_until_file_is_ready(path: str):
-    last_size = -1
-    stable_count = 0
-    for i in range(RETRIES * 2):  # allow more retries for large files
-        try:
-            size = os.path.getsize(path)
-            if size == last_size and size > 0:
-                stable_count += 1
-            else:
-                stable_count = 0
-            last_size = size
-            # Require file size to be stable for 2 consecutive checks
-            if stable_count >= 2:
+def file_sample(path: str):
+    """(size, mtime_ns) of `path`, or None if it cannot be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+# Minimum time a file's size and mtime must hold still before it is ready; set
+# by start_processing() to FILE_READY_POLLED_STABLE when the watch folder is polled
+file_ready_stable = FILE_READY_MIN_DELAY
+
+def wait_until_file_is_ready(path: str, first_sample=None, sampled_at=0.0):
+    """
+    Wait until size and mtime have held still for file_ready_stable seconds and
+    the file opens. Samples start FILE_READY_MIN_DELAY apart and back off
+    exponentially up to FILE_READY_POLL, so on a local disk a finished file is
+    ready almost at once while a file still being written is not polled in a
+    tight loop. `first_sample` is a file_sample() taken when the file was found
+    (at time.monotonic() `sampled_at`).
+    """
+    deadline = time.monotonic() + FILE_READY_TIMEOUT
+    delay = FILE_READY_MIN_DELAY
+    last, stable_since = first_sample, sampled_at
+    if last is not None:
+        time.sleep(max(0.0, sampled_at + delay - time.monotonic()))
+    while True:
+        sample = file_sample(path)
+        now = time.monotonic()
+        if sample is None or sample != last or sample[0] == 0:
+            last, stable_since = sample, now
+        elif now - stable_since >= file_ready_stable:
+            try:
                 with open(path, 'rb') as f:
                     f.read(1)
                 return
-        except (PermissionError, IOError, FileNotFoundError):
-            logging.info(f"{path} not ready, retry {i + 1}/{RETRIES * 2}")
-        time.sleep(RETRY_DELAY)
-    raise TimeoutError(f"{path} not ready after {(RETRIES * 2) * RETRY_DELAY}s")
+            except OSError:
+                # Still locked by the writer (Windows)
+                last, stable_since = None, now
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"{path} not ready after {FILE_READY_TIMEOUT}s")
+        time.sleep(delay)
+        delay = min(delay * 2, FILE_READY_POLL)
 
 from pytesseract import TesseractError
 
-def detect_orientation(pdf_document, source_path: str, page_no: int, initial_dpi=200, max_trials=3):
+# Optional: tesserocr runs OSD in-process through libtesseract. Without it every
+# OSD call forks the tesseract binary and reloads osd.traineddata.
+try:
+    from tesserocr import PyTessBaseAPI, PSM
+except ImportError:
+    PyTessBaseAPI = None
+
+# Per-process OSD API, reused across all pages and PDFs handled by the process
+_osd_api = None
+# Set once the API failed to initialize in this process: OSD then goes
+# through pytesseract instead
+_osd_api_failed = False
+
+def _get_osd_api():
+    """Return the process-wide tesserocr API (None without tesserocr), creating it on first use."""
+    global _osd_api, _osd_api_failed
+    if _osd_api is None and PyTessBaseAPI is not None and not _osd_api_failed:
+        try:
+            # lang='osd': load only osd.traineddata, not the default 'eng' model
+            _osd_api = PyTessBaseAPI(psm=PSM.OSD_ONLY, lang='osd')
+        except Exception as e:
+            # Missing osd.traineddata or tessdata path: this runs in the pool
+            # initializer, where an exception would break the whole pool, so
+            # fall back to pytesseract for the rest of this process
+            logging.warning(f"tesserocr OSD unavailable, falling back to pytesseract: {e}")
+            _osd_api_failed = True
+            return None
+        _osd_api.SetVariable('min_characters_to_try', '5')  # same as OSD_CONFIG
+    return _osd_api
+
+def _init_worker(q):
+    # Ctrl+C reaches the whole process group: leave it to the main process,
+    # which shuts the pool down in order, instead of interrupting a worker
+    # halfway through a put on the shared log queue
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _install_queue_handler(q)
+    # Pay the libtesseract/traineddata setup when the worker starts, not on its first page
+    _get_osd_api()
+    # Likewise load MuPDF's built-in font once up front
+    with fitz.open() as doc:
+        doc.new_page(width=10, height=10).insert_text((0, 5), "x")
+
+@functools.lru_cache(maxsize=None)
+def _osd_matrix(dpi):
+    # A handful of DPI steps are ever used; build each zoom matrix once
+    return fitz.Matrix(dpi / 72, dpi / 72)
+
+def _render_for_osd(page, dpi, clip=None):
+    # OSD binarizes its input anyway: a grayscale pixmap without alpha is one
+    # byte per pixel instead of three or four
+    rect = fitz.Rect(clip) if clip is not None else page.rect
+    # Never render more than OSD_MAX_PX pixels per side: larger areas (big
+    # formats, or the 150 DPI retry) are cut down to their centre, so OSD cost
+    # is bounded regardless of page size
+    # (one pixel short of it, as pixmap bounds are rounded outwards)
+    max_pt = (OSD_MAX_PX - 1) * 72 / dpi
+    if rect.width > max_pt or rect.height > max_pt:
+        centre = (rect.tl + rect.br) / 2
+        half_w, half_h = min(rect.width, max_pt) / 2, min(rect.height, max_pt) / 2
+        rect = fitz.Rect(centre.x - half_w, centre.y - half_h, centre.x + half_w, centre.y + half_h)
+    return page.get_pixmap(matrix=_osd_matrix(dpi), colorspace=fitz.csGRAY, alpha=False, clip=rect)
+
+def _run_osd(pix, api=None):
+    """Return (clockwise rotation needed to make the page upright, confidence)."""
+    if api is not None:
+        # Hand the raw pixmap buffer to libtesseract directly, no PIL/PNG involved
+        api.SetImageBytes(pix.samples, pix.width, pix.height, pix.n, pix.stride)
+        res = api.DetectOrientationScript()
+        if not res:
+            raise RuntimeError("tesserocr OSD returned no result")
+        # orient_deg is the page's current clockwise orientation
+        return (360 - int(res['orient_deg'])) % 360, float(res['orient_conf'])
+    # Given a PIL image, pytesseract would encode it to PNG in a temp file for
+    # the tesseract binary. A PGM/PPM file is just a header and the raw samples,
+    # and a path is passed through untouched.
+    magic = {1: b'P5', 3: b'P6'}[pix.n]
+    fd, path = tempfile.mkstemp(suffix='.pnm', dir=OSD_TMP_DIR)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(b'%s\n%d %d\n255\n' % (magic, pix.width, pix.height))
+            f.write(pix.samples_mv)
+        osd = pytesseract.image_to_osd(path, config=OSD_CONFIG, output_type=pytesseract.Output.DICT)
+    finally:
+        os.remove(path)
+    return int(osd.get('rotate', 0) or 0), float(osd.get('orientation_conf', 0) or 0.0)
+
+# OSD only classifies glyph orientation, so low resolution is enough; a page
+# whose confidence is too low gets one more try at 150 DPI, where OSD is
+# reliable, instead of several small steps
+OSD_INITIAL_DPI = 75
+OSD_DPI_STEP = 75
+OSD_MAX_TRIALS = 2
+# pytesseract already runs image_to_osd with --psm 0 (OSD only) and -l osd;
+# let OSD try sparse pages instead of bailing out below the default 50 characters
+OSD_CONFIG = '-c min_characters_to_try=5'
+# Where the pytesseract path writes its OSD input: RAM-backed where available
+OSD_TMP_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+# Vertical extent (fractions of page height) of the central band OSD looks at first
+OSD_BAND = (0.3, 0.7)
+# Upper bound on either side of the image handed to OSD, in pixels
+OSD_MAX_PX = 1200
+
+# Born-digital pages with at least this much extractable text skip OSD
+TEXT_MIN_CHARS = 50
+
+def _text_orientation(page):
+    """
+    Orientation of a born-digital page from its text layer, or None when the
+    page has too little text (scans). Returns the clockwise rotation needed to
+    make the dominant writing direction read left-to-right, as OSD does.
+    """
+    m = page.rotation_matrix
+    votes = {}
+    chars = 0
+    # TEXTFLAGS_TEXT: no image data in the dict, only text
+    for block in page.get_text("dict", flags=fitz.TEXTFLAGS_TEXT)["blocks"]:
+        for line in block.get("lines", ()):
+            n = sum(len(span["text"].strip()) for span in line["spans"])
+            if not n:
+                continue
+            # Line direction is in unrotated page space; apply /Rotate (the
+            # linear part of rotation_matrix) to get the direction as displayed
+            x, y = line["dir"]
+            dx, dy = x * m.a + y * m.c, x * m.b + y * m.d
+            angle = round(-math.degrees(math.atan2(dy, dx)) / 90) * 90 % 360
+            votes[angle] = votes.get(angle, 0) + n
+            chars += n
+    if chars <= TEXT_MIN_CHARS:
+        return None
+    return max(votes, key=votes.get)
+
+def detect_orientation(page, source_path: str, page_no: int, initial_dpi=OSD_INITIAL_DPI, max_trials=OSD_MAX_TRIALS, api=None):
     dpi = initial_dpi
     last_rotate = 0
     last_conf = 0
 
+    # Text-layer shortcut: no rendering, no Tesseract
+    try:
+        rotate = _text_orientation(page)
+    except Exception as e:
+        logging.debug("Text orientation failed for %s, page %d: %s", source_path, page_no + 1, e)
+        rotate = None
+    if rotate is not None:
+        logging.debug("Orientation %d from text layer (File=%s, Page=%d)", rotate, source_path, page_no + 1)
+        return rotate
+
+    # OSD band is the same for every trial
+    band = fitz.Rect(0, page.rect.height * OSD_BAND[0], page.rect.width, page.rect.height * OSD_BAND[1])
+
     for trial in range(1, max_trials + 1):
         try:
-            # rasterize page → PIL image
-            pix = pdf_document[0].get_pixmap(dpi=dpi)
-            png_bytes = pix.tobytes("png")   # ensure it's actual PNG data
-            img = Image.open(io.BytesIO(png_bytes))
-
-            # run OSD
-            try:
-                osd = pytesseract.image_to_osd(img, output_type=pytesseract.Output.DICT)
-                rotate = int(osd.get('rotate', 0) or 0)
-                conf   = float(osd.get('orientation_conf', 0) or 0.0)
-            except TesseractError as te:
-                logging.warning(f"OSD failed for {source_path}, page {page_no+1}: {te}")
-                rotate, conf = 0, 0.0
+            # run OSD on the central band first. Once the band proves insufficient
+            # (OSD error or low confidence) the full page is tried at the same DPI
+            # before escalating, and later trials no longer render the band.
+            rotate, conf = 0, 0.0
+            if band is not None:
+                try:
+                    rotate, conf = _run_osd(_render_for_osd(page, dpi, band), api)
+                except (TesseractError, RuntimeError) as te:
+                    logging.debug("Band OSD failed for %s, page %d: %s", source_path, page_no + 1, te)
+                if conf < 2:
+                    band = None
+            if band is None:
+                try:
+                    rotate, conf = _run_osd(_render_for_osd(page, dpi), api)
+                except (TesseractError, RuntimeError) as te:
+                    logging.warning(f"OSD failed for {source_path}, page {page_no+1}: {te}")
+                    rotate, conf = 0, 0.0
 
-            logging.debug(f"Trial {trial}: DPI={dpi}, orientation={rotate}, confidence={conf}"
-                          f" (File={source_path}, Page={page_no + 1})")
+            logging.debug("Trial %d: DPI=%d, orientation=%s, confidence=%s (File=%s, Page=%d)",
+                          trial, dpi, rotate, conf, source_path, page_no + 1)
 
             if conf >= 2:
                 if trial > 1:
-                    logging.info(f"Orientation ({rotate}) stabilized at trial {trial}"
-                                 f" (DPI={dpi}, confidence={conf}) {source_path}, page {page_no+1}")
+                    logging.info("Orientation (%s) stabilized at trial %d (DPI=%d, confidence=%s) %s, page %d",
+                                 rotate, trial, dpi, conf, source_path, page_no + 1)
                 return rotate
 
             # too low confidence → bump DPI and retry
             last_rotate, last_conf = rotate, conf
             logging.warning(f"Low orientation confidence ({conf:.1f}) at DPI={dpi}"
                             f" for {source_path}, page {page_no + 1}; retrying with higher DPI.")
-            dpi += 100
+            dpi += OSD_DPI_STEP
 
         except Exception as e:
             err_msg = (f"Orientation detection failed on trial {trial} "
                        f"(DPI={dpi}) for {source_path}, page {page_no + 1}: {e}")
-            logging.error(err_msg, exc_info=True)
-            log_error(source_path, err_msg)
-            dpi += 100
+            logging.error(err_msg, exc_info=True, extra={'file': source_path})
+            dpi += OSD_DPI_STEP
 
     logging.warning(f"Max trials reached for {source_path}, page {page_no+1}. "
                     f"Returning last {last_rotate}° @ confidence {last_conf}")
     return last_rotate
 
 def rotate_pdf(page_doc, rotation_angle):
+    # Rotate in place through each page's /Rotate entry: a metadata edit, no
+    # rendering, so text and vector content are kept as they are
+    for page in page_doc:
+        page.set_rotation((page.rotation + rotation_angle) % 360)
+    return page_doc
+
+def should_rasterize(page, angle) -> bool:
+    # RASTER_ROTATION only ever applies to image-only pages: re-rendering a page
+    # with a text layer would throw away its text and vector content
+    return bool(angle) and RASTER_ROTATION and not page.get_text("text").strip()
+
+def raster_rotate_pdf(page_doc, rotation_angle):
+    # Raster fallback (RASTER_ROTATION, image-only pages): renders each page and
+    # embeds the bitmap, which loses vector content and text
     if rotation_angle == 0:
         return page_doc
     try:
@@ -148,8 +456,12 @@ def rotate_pdf(page_doc, rotation_angle):
         return page_doc
 
 # === Progress counters ===
-total_count = len(processed_files)
-done_count   = len(processed_files)
+# PDFs and pages are counted separately; the percentage follows pages, since
+# PDFs are split across the workers and a single long one can dominate a run
+total_count = 0  # set from the processed store by start_processing()
+done_count   = 0
+total_pages = 0
+done_pages  = 0
 total_lock = threading.Lock()
 done_lock = threading.Lock()
 
@@ -158,150 +470,459 @@ def increment_total():
     with total_lock:
         total_count += 1
 
+def add_pages(n: int):
+    global total_pages
+    with total_lock:
+        total_pages += n
+
+def _log_progress():
+    # Called with done_lock held
+    pct = (done_pages / total_pages * 100) if total_pages else 0
+    logging.info("Progress: %d/%d pages (%.1f%%), %d/%d PDFs processed",
+                 done_pages, total_pages, pct, done_count, total_count)
+
+def update_page_progress(n: int = 1):
+    global done_pages
+    with done_lock:
+        done_pages += n
+        _log_progress()
+
 def update_progress(_future):
     global done_count, total_count
     with done_lock:
         done_count += 1
-        pct = (done_count / total_count * 100) if total_count else 0
-        logging.info(f"Progress: {done_count}/{total_count} PDFs processed ({pct:.1f}%)")
+        _log_progress()
 
-# The processing function
-def process_pdf(pdf_path: str):
-    with processed_lock:
-        if pdf_path in processed_files:
-            logging.info(f"{pdf_path} already processed, skipping.")
-            return
+# Options for every page PDF written: drop unreferenced objects, merge
+# duplicate ones and compress streams. clean=True is left out: rewriting the
+# content streams doubles the save time for ~1% smaller files
+SAVE_OPTIONS = dict(garbage=4, deflate=True)
 
-    start = time.time()
-    logging.info(f"Processing {pdf_path}")
+# Per-page work, run in the pool workers
+def process_page(pdf_path: str, pno: int, target_dir: str, fname_prefix: str):
+    doc = fitz.open(pdf_path)
     try:
-        doc = fitz.open(pdf_path)
-        base = os.path.splitext(os.path.basename(pdf_path))[0]
-        # Get relative path from WATCH_FOLDER to PDF's parent
-        rel_dir = os.path.relpath(os.path.dirname(pdf_path), WATCH_FOLDER)
-        # Split into parts
-        rel_parts = os.path.normpath(rel_dir).split(os.sep)
-        # Customer is always the first part
-        customer_folder = rel_parts[0]
-        # All subfolders under customer (may be empty)
-        subfolders = rel_parts[1:] if len(rel_parts) > 1 else []
-        # Clean customer folder name
-        target_dir = os.path.join(OUTPUT_FOLDER, clean_name(customer_folder, OUTPUT_FOLDER, kind="dir"))
-        os.makedirs(target_dir, exist_ok=True)
-
-        for pno in range(doc.page_count):
-            try:
-                single = fitz.open()
-                single.insert_pdf(doc, from_page=pno, to_page=pno)
+        # One OSD API for every page handled by this worker
+        api = _get_osd_api()
 
-                angle = detect_orientation(single, pdf_path, pno)
-                logging.info(f"Page {pno + 1}: detected rotation {angle}° for {pdf_path}")
+        single = None
+        try:
+            # Detect on the source page itself; the single-page copy is only
+            # built once there is something to save
+            angle = detect_orientation(doc[pno], pdf_path, pno, api=api)
+            logging.info("Page %d: detected rotation %d° for %s", pno + 1, angle, pdf_path)
+
+            cleaned_out_fname = clean_name(f"{fname_prefix}{pno + 1}.pdf", kind="file")
+            out_path = resolve_collision(target_dir, cleaned_out_fname)
+
+            single = fitz.open()
+            single.insert_pdf(doc, from_page=pno, to_page=pno)
+            if should_rasterize(doc[pno], angle):
+                rotated = raster_rotate_pdf(single, angle)
+                rotated.save(out_path, **SAVE_OPTIONS)
+                rotated.close()
+            else:
+                if angle:
+                    rotate_pdf(single, angle)
+                single.save(out_path, **SAVE_OPTIONS)
 
-                # Flatten subfolders for filename
-                subfolder_part = '_'.join(subfolders) if subfolders else ''
-                parts = [subfolder_part, base, f"page_{pno + 1}.pdf"] if subfolder_part else [base, f"page_{pno + 1}.pdf"]
-                raw_out_fname = '_'.join(parts)
-                cleaned_out_fname = clean_name(raw_out_fname, target_dir, kind="file")
-                out_path = resolve_collision(Path(target_dir) / cleaned_out_fname)
+            logging.info("Saved %s", out_path)
 
-                if angle:
-                    rotated = rotate_pdf(single, angle)
-                    rotated.save(str(out_path))
-                    rotated.close()
-                else:
-                    single.save(str(out_path))
+        except Exception as e:
+            # Log the error but keep going
+            logging.error(f"Page {pno+1} error: {e}", exc_info=True, extra={'file': pdf_path})
+            # Still save the *original* single-page PDF if you want:
+            backup = fitz.open()
+            try:
+                backup.insert_pdf(doc, from_page=pno, to_page=pno)
+                backup_path = Path(target_dir) / f"page_{pno+1}_backup.pdf"
+                backup.save(str(backup_path), **SAVE_OPTIONS)
+                logging.info("Saved backup (unrotated) to %s", backup_path)
+            except Exception:
+                pass
+            finally:
+                backup.close()
+        finally:
+            if single is not None:
                 single.close()
+    finally:
+        doc.close()
 
-                logging.info(f"Saved {out_path}")
-
+# Whole-PDF work (SPLIT_PAGES=false), run in the pool workers: every page is
+# oriented and appended to one output document, which is saved once
+def process_document(pdf_path: str, target_dir: str, out_fname: str):
+    api = _get_osd_api()
+    with fitz.open(pdf_path) as doc, fitz.open() as out:
+        for pno in range(doc.page_count):
+            try:
+                angle = detect_orientation(doc[pno], pdf_path, pno, api=api)
+                logging.info("Page %d: detected rotation %d° for %s", pno + 1, angle, pdf_path)
+                rasterize = should_rasterize(doc[pno], angle)
             except Exception as e:
-                # Log the error but keep going
-                logging.error(f"Error processing page {pno+1} of {pdf_path}: {e}", exc_info=True)
-                log_error(pdf_path, f"Page {pno+1} error: {e}")
-                # Still save the *original* single-page PDF if you want:
-                try:
-                    backup_path = Path(target_dir) / f"page_{pno+1}_backup.pdf"
-                    single.save(str(backup_path))
-                    logging.info(f"Saved backup (unrotated) to {backup_path}")
-                except Exception:
-                    pass
-                finally:
-                    single.close()
-                continue
-
-        doc.close()
-        append_processed_file(pdf_path)
-        logging.info(f"Finished {pdf_path} in {time.time() - start:.2f}s")
-        # Remove source file after successful processing and logging
+                # As with split pages, a failing page is kept unrotated rather
+                # than failing the whole PDF
+                logging.error(f"Page {pno+1} error: {e}", exc_info=True, extra={'file': pdf_path})
+                angle, rasterize = 0, False
+            if rasterize:
+                with fitz.open() as single:
+                    single.insert_pdf(doc, from_page=pno, to_page=pno)
+                    rotated = raster_rotate_pdf(single, angle)
+                    out.insert_pdf(rotated)
+                    if rotated is not single:
+                        rotated.close()
+            else:
+                out.insert_pdf(doc, from_page=pno, to_page=pno)
+                if angle:
+                    page = out[-1]
+                    page.set_rotation((page.rotation + angle) % 360)
+        out_path = resolve_collision(target_dir, clean_name(out_fname, kind="file"))
+        out.save(out_path, **SAVE_OPTIONS)
+    logging.info("Saved %s", out_path)
+
+# === Page-level jobs ===
+# Every PDF is fanned out into one pool task per page, so a long PDF is spread
+# over all workers instead of pinning one. Pages stay in worker processes:
+# PyMuPDF is not thread-safe. The parent only opens a PDF (under fitz_lock) to
+# count its pages, and finishes it once its last page task is done.
+fitz_lock = threading.Lock()
+pdf_jobs = {}  # pdf_path -> {'remaining': tasks left, 'failed': bool, 'start': time, 'signature': (mtime, size)}
+pdf_jobs_lock = threading.Lock()
+
+def finish_pdf(pdf_path: str, start: float, signature):
+    append_processed_file(pdf_path, signature)
+    logging.info("Finished %s in %.2fs", pdf_path, time.time() - start)
+    # Remove source file after successful processing and logging
+    try:
+        os.remove(pdf_path)
+        logging.info("Removed source file: %s", pdf_path)
+    except Exception as e:
+        logging.warning(f"Failed to remove source file {pdf_path}: {e}")
+    update_progress(None)
+
+def abandon_pdf(pdf_path: str, tasks: int, pages: int):
+    # `tasks` (covering `pages` pages) could not be submitted: count them as
+    # failed, so the job still completes and the source is kept for a retry
+    with pdf_jobs_lock:
+        job = pdf_jobs[pdf_path]
+        job['remaining'] -= tasks
+        job['failed'] = True
+        last = not job['remaining']
+        if last:
+            del pdf_jobs[pdf_path]
+    update_page_progress(pages)
+    if last:
+        update_progress(None)
+
+def submit_task(pdf_path: str, fn, *args, pages: int = 1) -> bool:
+    """Submit one task of `pdf_path` to the pool; False (slot released, error logged) if the pool refuses it."""
+    # Blocks while the pool already holds enough pages to keep it busy
+    inflight_pages.acquire()
+    try:
+        future = executor.submit(fn, *args)
+    except Exception as e:
+        inflight_pages.release()
+        logging.error(f"Error on {pdf_path}: cannot submit to the pool: {e}", extra={'file': pdf_path})
+        return False
+    future.add_done_callback(functools.partial(page_done, pdf_path, pages=pages))
+    return True
+
+def page_done(pdf_path: str, future, pages: int = 1):
+    inflight_pages.release()
+    failed = False
+    if future.cancelled():
+        # Dropped at shutdown; the source stays for the next run
+        failed = True
+    else:
         try:
-            os.remove(pdf_path)
-            logging.info(f"Removed source file: {pdf_path}")
+            future.result()
         except Exception as e:
-            logging.warning(f"Failed to remove source file {pdf_path}: {e}")
+            logging.error(f"Error on {pdf_path}: {e}", extra={'file': pdf_path})
+            failed = True
+    with pdf_jobs_lock:
+        job = pdf_jobs[pdf_path]
+        job['remaining'] -= 1
+        job['failed'] = job['failed'] or failed
+        last = not job['remaining']
+        if last:
+            del pdf_jobs[pdf_path]
+    update_page_progress(pages)
+    if not last:
+        return
+    if job['failed']:
+        # Keep the source so it is picked up again on the next run
+        update_progress(None)
+    else:
+        finish_pdf(pdf_path, job['start'], job['signature'])
+
+# The processing function (parent side): count pages and submit one task per page
+def process_pdf(pdf_path: str):
+    if is_processed(pdf_path):
+        logging.info("%s already processed, skipping.", pdf_path)
+        update_progress(None)
+        return
+    with pdf_jobs_lock:
+        if pdf_path in pdf_jobs:
+            logging.info("%s already in progress, skipping.", pdf_path)
+            update_progress(None)
+            return
+        # Reserve the path: the scanner and the watcher may submit the same file
+        pdf_jobs[pdf_path] = None
 
+    start = time.time()
+    logging.info("Processing %s", pdf_path)
+    try:
+        # Taken before reading, so a file changed mid-run is not marked done
+        signature = file_signature(pdf_path)
+        with fitz_lock:
+            with fitz.open(pdf_path) as doc:
+                page_count = doc.page_count
+        # Get relative path from WATCH_FOLDER to PDF's parent
+        rel_dir = os.path.relpath(os.path.dirname(pdf_path), WATCH_FOLDER)
+        # Customer is always the first part, then the subfolders down to the PDF
+        customer_folder, *subfolders = os.path.normpath(rel_dir).split(os.sep)
+        # Clean customer folder name
+        target_dir = os.path.join(OUTPUT_FOLDER, clean_name(customer_folder, kind="dir"))
+        os.makedirs(target_dir, exist_ok=True)
+        # Output names are <subfolders>_<base>_page_<n>.pdf; everything but the
+        # page number is computed once here rather than in every page task
+        base = os.path.splitext(os.path.basename(pdf_path))[0]
+        fname_prefix = '_'.join([*subfolders, base, 'page_'])
+        # Without splitting the output is <subfolders>_<base>.pdf
+        merged_fname = '_'.join([*subfolders, base]) + '.pdf'
     except Exception as e:
-        logging.error(f"Error on {pdf_path}: {e}")
-        log_error(pdf_path, str(e))
+        logging.error(f"Error on {pdf_path}: {e}", extra={'file': pdf_path})
+        with pdf_jobs_lock:
+            del pdf_jobs[pdf_path]
+        update_progress(None)
+        return
+
+    if page_count == 0:
+        with pdf_jobs_lock:
+            del pdf_jobs[pdf_path]
+        finish_pdf(pdf_path, start, signature)
+        return
+    add_pages(page_count)
+    with pdf_jobs_lock:
+        pdf_jobs[pdf_path] = {'remaining': page_count if SPLIT_PAGES else 1, 'failed': False,
+                              'start': start, 'signature': signature}
+    if not SPLIT_PAGES:
+        # A single task, so the output document is written by one process
+        if not submit_task(pdf_path, process_document, pdf_path, target_dir, merged_fname, pages=page_count):
+            abandon_pdf(pdf_path, 1, page_count)
+        return
+    for pno in range(page_count):
+        if not submit_task(pdf_path, process_page, pdf_path, pno, target_dir, fname_prefix):
+            abandon_pdf(pdf_path, page_count - pno, page_count - pno)
+            return
 
-# Queue + executor
-job_queue = queue.Queue()
-executor = ProcessPoolExecutor(max_workers=MAX_WORKERS)
+# Executor. Pages in flight are bounded, so a huge backlog (scan of an existing
+# tree) is fed in as the workers drain it instead of being submitted up front:
+# the submitting thread blocks in process_pdf
+inflight_pages = threading.BoundedSemaphore(MAX_WORKERS * 4)
+executor = None  # created by start_processing()
 
-def queue_worker():
+def submit(pdf_path: str, first_sample=None, sampled_at=0.0):
+    """Wait for `pdf_path` to be ready, then fan it out to the pool (called from the scanner and watcher threads)."""
+    increment_total()
+    try:
+        wait_until_file_is_ready(pdf_path, first_sample, sampled_at)
+    except Exception as e:
+        logging.error(str(e), extra={'file': pdf_path})
+        update_progress(None)
+        return
+    process_pdf(pdf_path)
+
+# === Debounced event handling ===
+# The observer thread only records the time of the latest event per path; the
+# debounce thread picks up paths that have been quiet for DEBOUNCE_DELAY, so a
+# burst of events for one file becomes a single job and a slow file never
+# blocks detection of the others. The file is also sampled at its last event,
+# so its readiness window (file_ready_stable) runs from there and not from
+# when the debounce thread, which handles paths one at a time, reaches it.
+pending_events = {}  # path -> (time.monotonic() of the last event, file_sample() at that time)
+pending_lock = threading.Lock()
+
+def record_event(path: str, refresh_only: bool = False):
+    entry = (time.monotonic(), file_sample(path))
+    with pending_lock:
+        # refresh_only: the debounce thread may have taken the path meanwhile
+        if refresh_only and path not in pending_events:
+            return
+        pending_events[path] = entry
+
+def debounce_worker():
     while True:
-        pdf_path = job_queue.get()
-        job_queue.task_done()
-        if pdf_path is None:
-            break
-        increment_total()
-        future = executor.submit(process_pdf, pdf_path)
-        future.add_done_callback(update_progress)
+        time.sleep(DEBOUNCE_DELAY / 2)
+        now = time.monotonic()
+        with pending_lock:
+            ready = [(p, e) for p, e in pending_events.items() if now - e[0] >= DEBOUNCE_DELAY]
+            for p, _ in ready:
+                del pending_events[p]
+        for path, (sampled_at, sample) in ready:
+            # A failure on one file must not stop the thread, or the watcher
+            # would silently stop processing anything
+            try:
+                if is_processed(path):
+                    continue
+                logging.info("Submitting %s", path)
+                submit(path, sample, sampled_at)
+            except Exception as e:
+                logging.error(f"Error on {path}: {e}", exc_info=True, extra={'file': path})
+
+# Hidden entries ('.*') and Office lock files ('~$*') are never processed
+SKIP_PREFIXES = ('.', '~$')
 
-# Start single queue thread
-t_queue = threading.Thread(target=queue_worker, daemon=True)
-t_queue.start()
+def is_candidate_pdf(path: str) -> bool:
+    # Only the 4-character tail is lowercased, not the whole path, since most
+    # events in a busy folder are for other files
+    if path[-4:].lower() != '.pdf':
+        return False
+    rel = os.path.relpath(path, WATCH_FOLDER)
+    return not any(part.startswith(SKIP_PREFIXES) for part in rel.split(os.sep))
 
 # Watchdog handler
 class PDFHandler(FileSystemEventHandler):
     def on_created(self, event):
-        if event.is_directory or not event.src_path.lower().endswith('.pdf'):
+        if event.is_directory or not is_candidate_pdf(event.src_path):
             return
+        record_event(event.src_path)
+
+    def on_moved(self, event):
+        # Uploaders often write 'x.pdf.part' and rename it to 'x.pdf' when done.
+        # The old path is gone: drop it, or the debounce thread would wait out
+        # FILE_READY_TIMEOUT on a file that no longer exists
+        with pending_lock:
+            pending_events.pop(event.src_path, None)
+        if event.is_directory or not is_candidate_pdf(event.dest_path):
+            return
+        record_event(event.dest_path)
+
+    def on_modified(self, event):
+        # Writes to a file still waiting out its debounce push its deadline back
+        with pending_lock:
+            if event.src_path not in pending_events:
+                return
+        record_event(event.src_path, refresh_only=True)
+
+NETWORK_FS_TYPES = {'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', 'fuse.sshfs', '9p', 'afs'}
+
+def is_network_path(path: str) -> bool:
+    """True if `path` is on a network mount, where native FS events are unreliable."""
+    path = os.path.realpath(path)
+    if os.name == 'nt':
+        if path.startswith('\\\\'):
+            return True  # UNC path
+        import ctypes
+        DRIVE_REMOTE = 4
+        return ctypes.windll.kernel32.GetDriveTypeW(os.path.splitdrive(path)[0] + '\\') == DRIVE_REMOTE
+    # Linux: file system type of the longest mount point containing the path
+    try:
+        with open('/proc/mounts') as f:
+            mounts = [line.split()[1:3] for line in f]
+    except OSError:
+        return False
+    best, fstype = '', ''
+    for mnt, fs in mounts:
+        mnt = mnt.replace('\\040', ' ')
+        if (path == mnt or path.startswith(mnt.rstrip('/') + '/')) and len(mnt) > len(best):
+            best, fstype = mnt, fs
+    return fstype in NETWORK_FS_TYPES
+
+def uses_polling(path: str) -> bool:
+    return WATCH_POLLING == 'true' or (WATCH_POLLING == 'auto' and is_network_path(path))
+
+def make_observer(path: str):
+    if uses_polling(path):
+        logging.info(f"Polling {path} every {WATCH_POLL_INTERVAL}s")
+        return PollingObserver(timeout=WATCH_POLL_INTERVAL)
+    return Observer()
+
+def _walk_pdfs(root: str):
+    # os.scandir: name and type come from the directory listing, no stat per entry.
+    # An explicit stack instead of recursion: no recursion limit on deep trees
+    # and no chain of nested generators for every yielded path. Each listing is
+    # read and closed before yielding, so a walk paused on a saturated pool does
+    # not hold directory handles open
+    stack = [root]
+    while stack:
+        dirpath = stack.pop()
         try:
-            wait_until_file_is_ready(event.src_path)
-            with processed_lock:
-                if event.src_path in processed_files:
-                    return
-            job_queue.put(event.src_path)
-            logging.info(f"Enqueued {event.src_path}")
-        except Exception as e:
-            log_error(event.src_path, str(e))
+            with os.scandir(dirpath) as it:
+                entries = list(it)
+        except OSError as e:
+            logging.warning(f"Cannot list {dirpath}: {e}")
+            continue
+        for entry in entries:
+            if entry.name.startswith(SKIP_PREFIXES):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name[-4:].lower() == '.pdf' and entry.is_file():
+                    yield entry.path
+            except OSError:
+                continue
+
+def iter_existing_pdfs(root: str):
+    """Yield the unprocessed PDFs under `root` as the walk finds them."""
+    for full in _walk_pdfs(root):
+        if not is_processed(full):
+            yield full
+
+# Existing files are gathered in batches and sampled as they are found, so the
+# first readiness interval is paid once per batch, not once per file
+SCAN_BATCH = MAX_WORKERS * 4
 
 def scan_existing_pdfs(root: str):
-    for dirpath, _, files in os.walk(root):
-        for fname in files:
-            if fname.lower().endswith('.pdf'):
-                full = os.path.join(dirpath, fname)
-                with processed_lock:
-                    if full in processed_files:
-                        continue
-                wait_until_file_is_ready(full)
-                job_queue.put(full)
-                logging.info(f"Enqueued existing {full}")
+    # submit() blocks while the pool is saturated, so the walk advances with the workers
+    pdfs = iter_existing_pdfs(root)
+    while True:
+        batch = [(full, file_sample(full), time.monotonic())
+                 for full in itertools.islice(pdfs, SCAN_BATCH)]
+        if not batch:
+            break
+        for full, sample, sampled_at in batch:
+            logging.info("Submitting existing %s", full)
+            try:
+                submit(full, sample, sampled_at)
+            except Exception as e:
+                logging.error(f"Error on {full}: {e}", exc_info=True, extra={'file': full})
+
+def start_processing(reset: bool = False):
+    """
+    Open the processed store, create the pool and start the background threads.
+    Main process only: the pool always uses the spawn start method, so every
+    pool worker re-imports this module.
+    """
+    global processed_db, executor, total_count, done_count, t_writer, file_ready_stable
+    processed_db = open_processed_db()
+    if reset:
+        reset_processed()
+        logging.info("Reset processed files list")
+    total_count = done_count = processed_count()
+    if uses_polling(WATCH_FOLDER):
+        file_ready_stable = FILE_READY_POLLED_STABLE
+
+    pool_args = {'max_tasks_per_child': MAX_TASKS_PER_CHILD} if RECYCLE_WORKERS else {}
+    executor = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=mp_context, initializer=_init_worker,
+                                   initargs=(log_queue,), **pool_args)
+
+    t_writer = threading.Thread(target=processed_writer, daemon=True)
+    t_writer.start()
+    threading.Thread(target=debounce_worker, daemon=True).start()
 
 if __name__ == "__main__":
-    # Optional reset
-    if os.getenv('RESET_PROGRESS', 'false').lower() == 'true':
-        if os.path.exists(PROCESSED_FILE_PATH):
-            os.remove(PROCESSED_FILE_PATH)
-        processed_files.clear()
-        logging.info("Reset processed files list")
+    setup_logging()
+    start_processing(reset=os.getenv('RESET_PROGRESS', 'false').lower() == 'true')
 
-    observer = Observer()
+    observer = make_observer(WATCH_FOLDER)
     observer.schedule(PDFHandler(), Path(WATCH_FOLDER), recursive=True)
     observer.start()
     logging.info(f"Watching {WATCH_FOLDER}")
 
-    scan_existing_pdfs(WATCH_FOLDER)
+    # Scan in the background so the main thread is free to handle Ctrl+C
+    t_scan = threading.Thread(target=scan_existing_pdfs, args=(WATCH_FOLDER,), daemon=True)
+    t_scan.start()
 
     try:
         while True:
@@ -312,11 +933,14 @@ if __name__ == "__main__":
         observer.stop()
         observer.join()
 
-        job_queue.put(None)
-        t_queue.join()
+        # Drop the queued pages and let the running ones finish. Workers are not
+        # terminated: killing a process while it writes to the log queue can
+        # corrupt the queue and hang the listener below
+        executor.shutdown(wait=True, cancel_futures=True)
 
-        for p in executor._processes.values():
-            p.terminate()
-        executor.shutdown(wait=False, cancel_futures=True)
+        # Flush the processed files still waiting in the writer
+        processed_writes.put(None)
+        t_writer.join()
 
         logging.info("All done, exiting.")
+        log_listener.stop()